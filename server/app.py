@@ -1,22 +1,46 @@
 # server/app.py
+import asyncio
 import os
+# One single-threaded tesseract per page scales better than tesseract's own OpenMP threading;
+# must be set before tesseract is first invoked.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+# PIL's decompression-bomb ceiling (2 * Image.MAX_IMAGE_PIXELS); OpenCV's own default is 2**30 pixels.
+# Exported before cv2 is imported so imdecode refuses larger images instead of allocating them;
+# set OPENCV_IO_MAX_IMAGE_PIXELS in the environment to override it.
+MAX_IMAGE_PIXELS = 2 * 89_478_485
+os.environ.setdefault("OPENCV_IO_MAX_IMAGE_PIXELS", str(MAX_IMAGE_PIXELS))
+import ctypes
+import functools
+import hashlib
 import logging
-from io import BytesIO
-from typing import Any, Dict, List
+import multiprocessing
+import tempfile
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO, StringIO
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 import PyPDF2
+from cachetools import LRUCache
+import pypdfium2 as pdfium
+import cv2
+import numpy as np
 from PIL import Image, UnidentifiedImageError
+import orjson
 import pytesseract
+from pdf2image import convert_from_bytes
 
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
-from collections import defaultdict
-import base64
+from nltk.tokenize import PunktTokenizer
+import binascii
+import heapq
 import re
 
 # --------------------------
@@ -31,7 +55,7 @@ if tesseract_cmd_override:
     pytesseract.pytesseract.tesseract_cmd = tesseract_cmd_override
 
 # FastAPI app
-app = FastAPI(title="Local Summarizer", version="1.0")
+app = FastAPI(title="Local Summarizer", version="1.0", default_response_class=ORJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],   # restrict in production
@@ -40,51 +64,232 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
-# Ensure NLTK data exists (download if missing)
-try:
-    nltk.data.find("tokenizers/punkt")
-except LookupError:
-    logger.info("Downloading punkt...")
-    nltk.download("punkt")
+# NLTK data is checked (and downloaded if missing) on first use rather than at import,
+# so spawning uvicorn/pool workers doesn't walk nltk.data.path every time
+_NLTK_LOCK = threading.Lock()
 
-try:
-    nltk.data.find("corpora/stopwords")
-except LookupError:
-    logger.info("Downloading stopwords...")
-    nltk.download("stopwords")
+def _download_nltk(resource: str, package: str) -> None:
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        logger.info("Downloading %s...", package)
+        # nltk.download reports failure by returning False; raise so _ensure_nltk's cache
+        # doesn't memoize the failed attempt and the next request retries
+        if not nltk.download(package):
+            raise LookupError(f"Could not download NLTK package '{package}'")
+
+@functools.cache
+def _ensure_nltk() -> None:
+    with _NLTK_LOCK:
+        # NLTK >= 3.9 tokenizes with the pickle-free punkt_tab model, not the old punkt pickle
+        _download_nltk("tokenizers/punkt_tab", "punkt_tab")
+        _download_nltk("corpora/stopwords", "stopwords")
+
+@functools.cache
+def _punkt() -> PunktTokenizer:
+    # English punkt model (pickle-free punkt_tab), built once instead of re-dispatching through sent_tokenize per request
+    _ensure_nltk()
+    return PunktTokenizer("english")
+
+@functools.cache
+def _stopwords() -> FrozenSet[str]:
+    _ensure_nltk()
+    return frozenset(stopwords.words("english"))
+
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+
+# Process pool for CPU-bound PDF page extraction (workers are spawned lazily on first submit).
+# The first submit happens on a request thread while OCR/request threads and PDFium are live,
+# so never fork this process: start workers from a clean forkserver (spawn where unavailable).
+PDF_WORKERS = max(1, int(os.getenv("PDF_WORKERS") or (os.cpu_count() or 1) - 1))
+_PDF_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+_PDF_POOL: Optional[ProcessPoolExecutor] = None
+_PDF_POOL_LOCK = threading.Lock()
+
+def _pdf_pool() -> ProcessPoolExecutor:
+    # created on first use: forkserver/spawn workers re-import this module and must not build pools of their own
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None:
+            _PDF_POOL = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=_PDF_MP_CONTEXT)
+        return _PDF_POOL
+
+def _discard_pdf_pool(pool: ProcessPoolExecutor) -> None:
+    # a crashed worker (e.g. PDFium segfault on a hostile PDF) breaks the pool for good: drop it so
+    # the next call builds a fresh one, unless another thread already has
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is pool:
+            _PDF_POOL = None
+    pool.shutdown(wait=False)
 
-STOPWORDS = set(stopwords.words("english"))
+# PDFium is not thread-safe: serialize its use within this process (pool workers are separate processes)
+_PDFIUM_LOCK = threading.Lock()
+# Below this page count the fork/pickle overhead outweighs the parallel speedup
+PDF_PARALLEL_MIN_PAGES = 8
+
+# Thread pool for OCR of rasterized PDF pages (tesseract runs outside the GIL)
+OCR_WORKERS = max(1, int(os.getenv("OCR_WORKERS") or os.cpu_count() or 1))
+_OCR_POOL = ThreadPoolExecutor(max_workers=OCR_WORKERS)
+OCR_DPI = 200
+TESSERACT_CONFIG = "--oem 1 --psm 6"
+# Past this many pages per worker, tesseract start-up dominates: OCR each worker's share via one listfile
+OCR_BATCH_PAGES_PER_WORKER = 8
+
+# In-memory cache of finished responses, keyed by a digest of the request inputs
+SUMMARY_CACHE_SIZE = 128
+_CACHE: LRUCache = LRUCache(maxsize=SUMMARY_CACHE_SIZE)
+_CACHE_LOCK = threading.Lock()  # requests are processed on worker threads
+
+# Uploads larger than this (decoded) are rejected with 413 before any decoding or extraction
+MAX_BYTES = int(os.getenv("MAX_UPLOAD_MB", "25")) * 1024 * 1024
+# Whole request bodies: base64 of MAX_BYTES plus headroom for the JSON envelope and prompt text
+MAX_BODY_BYTES = MAX_BYTES * 4 // 3 + 1024 * 1024
+
+# Base64 is decoded in chunks of this many characters (a multiple of 4, so chunks decode independently)
+B64_CHUNK = 64 * 1024
+_B64_JUNK_RE = re.compile(r"[^A-Za-z0-9+/=]")
 
 # --------------------------
 # Helpers: extract text
 # --------------------------
-def decode_inline_data(part: Dict[str, Any]) -> bytes:
+def _b64_decode_stream(s: str) -> bytearray:
+    """Decode base64 chunk by chunk into one preallocated buffer, avoiding a full-size intermediate copy."""
+    if not s.isascii():
+        raise ValueError("base64 data must be ASCII")
+    out = bytearray(len(s) * 3 // 4 + 3)
+    pos = 0
+    carry = ""
+    with memoryview(out) as view:
+        for i in range(0, len(s), B64_CHUNK):
+            # drop newlines/other non-alphabet characters (as b64decode does) and decode whole
+            # 4-character quanta only, carrying the remainder into the next chunk
+            piece = _B64_JUNK_RE.sub("", carry + s[i:i + B64_CHUNK])
+            cut = len(piece) - len(piece) % 4
+            carry = piece[cut:]
+            chunk = binascii.a2b_base64(piece[:cut])
+            view[pos:pos + len(chunk)] = chunk
+            pos += len(chunk)
+    if carry:
+        # leftover characters that don't form a full quantum: invalid padding
+        raise binascii.Error("Incorrect padding")
+    del out[pos:]
+    return out
+
+def decode_inline_data(part: Dict[str, Any]) -> bytearray:
     inline = part.get("inlineData")
     if not inline or "data" not in inline:
         raise ValueError("No inlineData.data found in part")
-    b64 = inline["data"]
-    return base64.b64decode(b64)
+    return _b64_decode_stream(inline["data"])
 
-def extract_text_from_pdf_bytes(file_bytes: bytes) -> str:
+def _open_pdfium(pdf_bytes: bytes) -> pdfium.PdfDocument:
+    if isinstance(pdf_bytes, bytearray):
+        # zero-copy view: pypdfium2 reads from bytes or ctypes arrays, not bytearrays
+        pdf_bytes = (ctypes.c_char * len(pdf_bytes)).from_buffer(pdf_bytes)
+    return pdfium.PdfDocument(pdf_bytes)
+
+def _extract_pages(pdf: pdfium.PdfDocument, start: int, end: int) -> str:
+    buf = StringIO()
+    for i in range(start, end):
+        page = pdf[i]
+        try:
+            textpage = page.get_textpage()
+            txt = textpage.get_text_range()
+            textpage.close()
+        except Exception:
+            txt = ""
+        finally:
+            page.close()
+        if txt:
+            buf.write(txt.replace("\r\n", "\n"))
+            buf.write("\n")
+    return buf.getvalue()
+
+def _extract_page_range(pdf_bytes: bytes, start: int, end: int) -> str:
+    """Extract text from pages [start, end). Runs in a pool worker, so it opens its own document."""
+    pdf = _open_pdfium(pdf_bytes)
+    try:
+        return _extract_pages(pdf, start, end)
+    finally:
+        pdf.close()
+
+def _extract_text_pypdf2(file_bytes: bytes) -> str:
+    """Pure-Python fallback for PDFs PDFium refuses to open (e.g. malformed/damaged files)."""
     try:
         reader = PyPDF2.PdfReader(BytesIO(file_bytes))
-        texts = []
+        buf = StringIO()
         for page in reader.pages:
             try:
                 txt = page.extract_text() or ""
             except Exception:
                 txt = ""
             if txt:
-                texts.append(txt)
-        return "\n".join(texts).strip()
+                buf.write(txt)
+                buf.write("\n")
+        return buf.getvalue().strip()
+    except PyPDF2.errors.FileNotDecryptedError:
+        logger.warning("PDF is password-protected; no text extracted")
+        return ""
+
+def extract_text_from_pdf_bytes(file_bytes: bytes) -> str:
+    try:
+        with _PDFIUM_LOCK:
+            try:
+                pdf = _open_pdfium(file_bytes)
+            except pdfium.PdfiumError as e:
+                logger.warning("PDFium could not open PDF (%s), falling back to PyPDF2", e)
+                pdf = None
+            if pdf is not None:
+                try:
+                    num_pages = len(pdf)
+                    if num_pages < PDF_PARALLEL_MIN_PAGES or PDF_WORKERS == 1:
+                        return _extract_pages(pdf, 0, num_pages).strip()
+                finally:
+                    pdf.close()
+        if pdf is None:
+            return _extract_text_pypdf2(file_bytes)
+        # ceiling division: at most PDF_WORKERS submissions, each of which pickles the whole file
+        chunk_size = -(-num_pages // PDF_WORKERS)
+        pool = _pdf_pool()
+        try:
+            futures = [
+                pool.submit(_extract_page_range, file_bytes, start, min(start + chunk_size, num_pages))
+                for start in range(0, num_pages, chunk_size)
+            ]
+            # every page in a worker's chunk is already newline-terminated
+            buf = StringIO()
+            for f in futures:
+                buf.write(f.result())
+            return buf.getvalue().strip()
+        except BrokenProcessPool:
+            logger.warning("PDF worker pool broke; rebuilding it and extracting this PDF inline")
+            _discard_pdf_pool(pool)
+            with _PDFIUM_LOCK:
+                return _extract_page_range(file_bytes, 0, num_pages).strip()
     except Exception as e:
         logger.exception("PDF extraction failed: %s", e)
         return ""
 
 def extract_text_from_image_bytes(file_bytes: bytes) -> str:
     try:
-        img = Image.open(BytesIO(file_bytes)).convert("RGB")
-        text = pytesseract.image_to_string(img)
+        try:
+            gray = cv2.imdecode(np.frombuffer(file_bytes, np.uint8), cv2.IMREAD_GRAYSCALE)
+        except cv2.error:
+            # OpenCV 5 raises (4.x returns None) e.g. for images over OPENCV_IO_MAX_IMAGE_PIXELS
+            gray = None
+        if gray is None:
+            # format OpenCV can't decode (e.g. GIF) or over the pixel limit: let PIL try before giving up
+            # (PIL raises DecompressionBombError for oversized images itself)
+            img = Image.open(BytesIO(file_bytes))
+            # tesseract discards colour anyway: keep 1-channel/RGB as-is, flatten palette/alpha modes to grayscale
+            if img.mode not in ("1", "L", "RGB"):
+                img = img.convert("L")
+            return pytesseract.image_to_string(img, config=TESSERACT_CONFIG).strip()
+        # binarize up front so tesseract spends less time in its own thresholding
+        bw = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 15)
+        text = pytesseract.image_to_string(bw, config=TESSERACT_CONFIG)
         return text.strip()
     except UnidentifiedImageError:
         logger.exception("Unidentified image")
@@ -93,12 +298,46 @@ def extract_text_from_image_bytes(file_bytes: bytes) -> str:
         logger.exception("Image OCR failed: %s", e)
         return ""
 
+def _ocr_image(path: str) -> str:
+    return pytesseract.image_to_string(path, config=TESSERACT_CONFIG).strip()
+
+def _ocr_image_batch(paths: List[str]) -> str:
+    """OCR several page images with a single tesseract process by handing it a listfile of their paths."""
+    # the listfile sits next to the rendered pages and is named after the batch's first page
+    listfile = os.path.splitext(paths[0])[0] + ".txt"
+    with open(listfile, "w") as fh:
+        fh.write("\n".join(paths) + "\n")
+    text = pytesseract.image_to_string(listfile, config=TESSERACT_CONFIG)
+    # tesseract separates pages with form feeds
+    return text.replace("\f", "\n").strip()
+
+def _ocr_pdf_pages(file_bytes: bytes) -> str:
+    """OCR fallback for scanned PDFs: rasterize every page and OCR the pages in parallel."""
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            # rasterize straight to grayscale files on disk, so memory doesn't grow with page count
+            pages = convert_from_bytes(
+                file_bytes, dpi=OCR_DPI, thread_count=1, grayscale=True, output_folder=tmp, paths_only=True
+            )
+            if OCR_WORKERS == 1 or len(pages) > OCR_BATCH_PAGES_PER_WORKER * OCR_WORKERS:
+                # one listfile per worker, contiguous so page order is preserved
+                per_batch = -(-len(pages) // OCR_WORKERS)
+                batches = [pages[i:i + per_batch] for i in range(0, len(pages), per_batch)]
+                texts = [t for t in _OCR_POOL.map(_ocr_image_batch, batches) if t]
+            else:
+                texts = [t for t in _OCR_POOL.map(_ocr_image, pages) if t]
+        return "\n".join(texts).strip()
+    except Exception as e:
+        logger.exception("PDF OCR failed: %s", e)
+        return ""
+
 def extract_text(mime_type: str, file_bytes: bytes) -> str:
     if mime_type in ("application/pdf", "application/x-pdf"):
         text = extract_text_from_pdf_bytes(file_bytes)
         if text:
             return text
-        # try OCR fallback for scanned PDFs (attempt to open as image pages omitted for brevity)
+        # no text layer: treat it as a scanned PDF
+        return _ocr_pdf_pages(file_bytes)
     if mime_type.startswith("image/"):
         return extract_text_from_image_bytes(file_bytes)
     # fallback: try pdf then image
@@ -110,63 +349,64 @@ def extract_text(mime_type: str, file_bytes: bytes) -> str:
 # --------------------------
 # Summarizer: extractive frequency-based
 # --------------------------
-def normalize_word(w: str) -> str:
-    return re.sub(r'[^a-zA-Z0-9]', '', w).lower()
-
-def build_word_freq(text: str) -> Dict[str, int]:
-    words = word_tokenize(text)
-    freq = defaultdict(int)
-    for w in words:
-        nw = normalize_word(w)
-        if not nw:
-            continue
-        if nw in STOPWORDS:
-            continue
-        freq[nw] += 1
+def sentence_token_ids(text: str, spans: Sequence[Tuple[int, int]]) -> Tuple[array, List[int], int]:
+    """
+    Scan each sentence span once, interning its tokens as it goes. Returns the token ids, the
+    cumulative token count at the end of each sentence and the number of distinct non-stopwords.
+    Stopwords all share id 0, whose frequency is zeroed in build_word_freq.
+    """
+    stop = _stopwords()
+    id_of: Dict[str, int] = {}
+    ids = array("i")
+    sent_ends: List[int] = []
+    for start, end in spans:
+        ids.extend(
+            0 if w in stop else id_of.setdefault(w, len(id_of) + 1)
+            for w in map(str.lower, _WORD_RE.findall(text, start, end))
+        )
+        sent_ends.append(len(ids))
+    return ids, sent_ends, len(id_of)
+
+def build_word_freq(ids: np.ndarray, vocab_size: int) -> np.ndarray:
+    freq = np.bincount(ids, minlength=vocab_size + 1)
+    freq[0] = 0
     return freq
 
-def score_sentences(sentences: List[str], freq: Dict[str, int]) -> Dict[int, float]:
-    scores = {}
-    for idx, sent in enumerate(sentences):
-        words = word_tokenize(sent)
-        score = 0.0
-        for w in words:
-            nw = normalize_word(w)
-            if not nw:
-                continue
-            score += freq.get(nw, 0)
-        scores[idx] = score / (len(words) + 1)
-    return scores
+def score_sentences(ids: np.ndarray, sent_ends: np.ndarray, freq: np.ndarray) -> np.ndarray:
+    # per-sentence sums as differences of a running sum (unlike reduceat, safe for empty sentences)
+    cum = np.concatenate(([0], np.cumsum(freq[ids])))
+    sent_starts = np.concatenate(([0], sent_ends[:-1]))
+    totals = cum[sent_ends] - cum[sent_starts]
+    return totals / (sent_ends - sent_starts + 1)
 
 def extractive_summarize(text: str, max_sentences: int = 4) -> str:
     if not text or len(text.strip()) < 50:
         return text.strip()
-    sentences = sent_tokenize(text)
-    if len(sentences) <= max_sentences:
-        return "\n\n".join(sentences)
-    freq = build_word_freq(text)
-    if not freq:
-        return "\n\n".join(sentences[:max_sentences])
-    scores = score_sentences(sentences, freq)
-    top_idxs = sorted(scores, key=lambda i: scores[i], reverse=True)[:max_sentences]
-    top_idxs_sorted = sorted(top_idxs)
-    selected = [sentences[i] for i in top_idxs_sorted]
-    return "\n\n".join(selected)
+    # punkt only splits after . ! or ?, so n terminators give at most n + 1 sentences;
+    # str.count is a C-level scan, far cheaper than tokenizing
+    if sum(text.count(c) for c in ".!?") < max_sentences:
+        return text.strip()
+    spans = list(_punkt().span_tokenize(text))
+    if len(spans) <= max_sentences:
+        return "\n\n".join(text[start:end] for start, end in spans)
+    ids, sent_ends, vocab_size = sentence_token_ids(text, spans)
+    # only stopwords/punctuation (typical of OCR noise): nothing to rank on, so skip the
+    # NumPy conversion and the frequency/scoring passes entirely
+    if not vocab_size:
+        return "\n\n".join(text[start:end] for start, end in spans[:max_sentences])
+    ids = np.frombuffer(ids, dtype=np.intc)
+    freq = build_word_freq(ids, vocab_size)
+    scores = score_sentences(ids, np.asarray(sent_ends, dtype=np.intp), freq).tolist()
+    # partial sort: O(n log k) instead of sorting every sentence to keep k of them
+    top_idxs = heapq.nlargest(max_sentences, range(len(scores)), key=scores.__getitem__)
+    top_idxs.sort()
+    # slice out only the selected sentences
+    return "\n\n".join(text[spans[i][0]:spans[i][1]] for i in top_idxs)
 
 # --------------------------
 # API route
 # --------------------------
-@app.post("/api/summarize")
-async def summarize_route(request: Request):
-    try:
-        payload = await request.json()
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid JSON payload")
-
-    contents = payload.get("contents")
-    if not contents or not isinstance(contents, list):
-        raise HTTPException(status_code=400, detail="Missing 'contents' array")
-
+def parse_contents(contents: List[Dict[str, Any]]) -> Tuple[Optional[bytearray], Optional[str], Optional[str]]:
     file_bytes = None
     mime_type = None
     prompt_text = None
@@ -179,32 +419,95 @@ async def summarize_route(request: Request):
                 mime_type = inline.get("mimeType")
                 b64 = inline.get("data")
                 if b64:
+                    if not isinstance(b64, str):
+                        raise HTTPException(status_code=400, detail="Invalid base64 data")
+                    if (len(b64) * 3) >> 2 > MAX_BYTES:
+                        raise HTTPException(status_code=413, detail="File too large")
                     try:
-                        file_bytes = base64.b64decode(b64)
+                        file_bytes = decode_inline_data(part)
                     except Exception:
                         raise HTTPException(status_code=400, detail="Invalid base64 data")
             elif isinstance(part, dict) and "text" in part and not prompt_text:
                 prompt_text = part["text"]
 
-    if not file_bytes:
-        raise HTTPException(status_code=400, detail="No inline file data found")
+    return file_bytes, mime_type, prompt_text
+
+def _cache_key(file_bytes: bytes, mime_type: Optional[str], prompt_text: Optional[str]) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for field in ((mime_type or "").encode(), (prompt_text or "").encode()):
+        # length-prefix so different (mime, prompt) splits can't produce the same stream
+        h.update(len(field).to_bytes(8, "little"))
+        h.update(field)
+    h.update(file_bytes)
+    return h.hexdigest()
+
+def _process(file_bytes: bytes, mime_type: Optional[str], prompt_text: Optional[str]) -> Dict[str, Any]:
+    key = _cache_key(file_bytes, mime_type, prompt_text)
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+    if cached is not None:
+        logger.info("Serving cached summary (mime=%s)", mime_type)
+        return cached
 
     logger.info("Extracting text from file (mime=%s)", mime_type)
     extracted_text = extract_text(mime_type or "", file_bytes)
     if not extracted_text:
-        return JSONResponse(status_code=200, content={
+        # not cached: the extract helpers also return "" after a logged (possibly transient) failure
+        return {
             "summary": "",
             "message": "No text could be extracted from the file. If it's an image, ensure it contains printed text (OCR)."
-        })
+        }
 
     combined_text = (prompt_text + "\n\n" + extracted_text) if prompt_text else extracted_text
     summary = extractive_summarize(combined_text, max_sentences=4)
 
-    return JSONResponse(status_code=200, content={
+    result = {
         "summary": summary,
         "source_text_length": len(extracted_text),
         "source_mime_type": mime_type or "unknown"
-    })
+    }
+    with _CACHE_LOCK:
+        _CACHE[key] = result
+    return result
+
+async def _read_body(request: Request) -> bytearray:
+    # read the stream directly: request.body()/request.json() keep the bytes/dict cached on the
+    # request for its whole lifetime, which would pin the upload through extraction and OCR.
+    # Growing one buffer also avoids holding the chunk list and the joined copy at once.
+    # Oversized requests are refused up front from Content-Length, or while streaming when it's absent.
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > MAX_BODY_BYTES:
+        raise HTTPException(status_code=413, detail="File too large")
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_BODY_BYTES:
+            raise HTTPException(status_code=413, detail="File too large")
+    return body
+
+@app.post("/api/summarize")
+async def summarize_route(request: Request):
+    raw = await _read_body(request)
+    try:
+        payload = orjson.loads(raw)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+    del raw  # the only reference to the raw JSON: free it before decoding/extraction
+
+    contents = payload.get("contents")
+    if not contents or not isinstance(contents, list):
+        raise HTTPException(status_code=400, detail="Missing 'contents' array")
+
+    file_bytes, mime_type, prompt_text = parse_contents(contents)
+    # drop the request's base64 strings so they can be collected before extraction/OCR runs
+    del payload, contents
+
+    if not file_bytes:
+        raise HTTPException(status_code=400, detail="No inline file data found")
+
+    # extraction/OCR/summarization are CPU-bound: keep them off the event loop
+    result = await asyncio.to_thread(_process, file_bytes, mime_type, prompt_text)
+    return ORJSONResponse(status_code=200, content=result)
 
 @app.get("/health")
 def health():